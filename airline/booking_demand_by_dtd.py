@@ -11,9 +11,15 @@ Example:
 """
 
 import csv
+import heapq
 import sys
-from collections import defaultdict
+from collections import Counter
 from datetime import datetime
+from itertools import accumulate
+
+
+# chosen_class values that mark a denied request
+_DENIED_CLASSES = frozenset({'DENIED', ''})
 
 
 def parse_date(date_str):
@@ -37,34 +43,65 @@ def analyze_booking_demand(csv_file, target_date):
         target_date: Target departure date to analyze
     
     Returns:
-        Dictionary with DTD as keys and booking counts as values
+        Dictionary with DTD as keys and booking counts as values, plus the set
+        of all departure dates seen in the file
     """
-    demand_by_dtd = defaultdict(int)
-    total_requests = 0
+    raw_dtd_counts = Counter()
+    all_dates = set()
     successful_bookings = 0
     denied_bookings = 0
     
-    with open(csv_file, 'r') as f:
-        reader = csv.DictReader(f)
+    with open(csv_file, 'r', newline='', buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return {
+                'demand_by_dtd': {},
+                'total_requests': 0,
+                'successful_bookings': 0,
+                'denied_bookings': 0,
+                'available_dates': all_dates
+            }
+        
+        # Project only the columns we need by index instead of building a dict per row
+        date_idx = header.index('departure_date')
+        dtd_idx = header.index('days_to_departure')
+        sale_idx = header.index('sale_successful') if 'sale_successful' in header else None
+        class_idx = header.index('chosen_class') if 'chosen_class' in header else None
         
         for row in reader:
+            # csv.reader yields [] for blank lines, which DictReader used to skip
+            if not row:
+                continue
+            
+            departure_date = row[date_idx]
+            all_dates.add(departure_date)
+            
             # Check if this booking is for our target date
-            if row['departure_date'] == target_date:
-                total_requests += 1
-                dtd = int(row['days_to_departure'])
-                demand_by_dtd[dtd] += 1
-                
-                # Count successful vs denied
-                if row.get('sale_successful') == 'True':
-                    successful_bookings += 1
-                elif row.get('chosen_class') in ['DENIED', '']:
-                    denied_bookings += 1
+            if departure_date != target_date:
+                continue
+            
+            # Count the raw DTD strings; int() runs once per distinct value below
+            raw_dtd_counts[row[dtd_idx]] += 1
+            
+            # Count successful vs denied
+            if sale_idx is not None and row[sale_idx] == 'True':
+                successful_bookings += 1
+            elif class_idx is not None and row[class_idx] in _DENIED_CLASSES:
+                denied_bookings += 1
+    
+    demand_by_dtd = Counter()
+    for dtd, count in raw_dtd_counts.items():
+        demand_by_dtd[int(dtd)] += count
+    
+    total_requests = sum(demand_by_dtd.values())
     
     return {
         'demand_by_dtd': dict(sorted(demand_by_dtd.items())),
         'total_requests': total_requests,
         'successful_bookings': successful_bookings,
-        'denied_bookings': denied_bookings
+        'denied_bookings': denied_bookings,
+        'available_dates': all_dates
     }
 
 
@@ -80,50 +117,48 @@ def print_demand_analysis(target_date, results):
     
     print("days_to_departure,booking_requests,cumulative_requests")
     
-    # Calculate cumulative from highest DTD (earliest) to 0 (departure)
-    cumulative = 0
-    for dtd in sorted(demand_by_dtd.keys(), reverse=True):
-        cumulative += demand_by_dtd[dtd]
-        # Store for later printing in ascending order
-    
-    # Print in ascending DTD order with correct cumulative
-    cumulative = 0
-    sorted_dtds = sorted(demand_by_dtd.keys(), reverse=True)
-    cumulative_values = {}
+    # analyze_booking_demand returns demand_by_dtd already in ascending DTD order
+    dtds = list(demand_by_dtd)
+    counts = list(demand_by_dtd.values())
     
-    for dtd in sorted_dtds:
-        cumulative += demand_by_dtd[dtd]
-        cumulative_values[dtd] = cumulative
+    # Cumulative from highest DTD (earliest) to 0 (departure) is a running sum of the reversed counts
+    cumulative_values = list(accumulate(reversed(counts)))[::-1]
     
-    # Print in ascending order
-    for dtd in sorted(demand_by_dtd.keys()):
-        print(f"{dtd},{demand_by_dtd[dtd]},{cumulative_values[dtd]}")
+    # Print in ascending order, as one write rather than one print per DTD
+    lines = [f"{dtd},{count},{cumulative}" for dtd, count, cumulative in zip(dtds, counts, cumulative_values)]
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
-def show_available_dates(csv_file, limit=20):
-    """Show available departure dates in the CSV file"""
-    dates = set()
-    
-    with open(csv_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            dates.add(row['departure_date'])
-    
-    sorted_dates = sorted(dates)
+def show_available_dates(csv_file, limit=20, dates=None):
+    """Show available departure dates in the CSV file (pass `dates` if already collected)"""
+    if dates is None:
+        dates = set()
+        
+        with open(csv_file, 'r', newline='', buffering=1 << 20) as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is not None:
+                # Only departure_date is needed; blank lines come through as [] and are skipped
+                date_idx = header.index('departure_date')
+                dates = {row[date_idx] for row in reader if row}
+    
+    # Only the first `limit` dates are listed, so take them with a bounded heap
+    # instead of sorting every date
+    first_dates = heapq.nsmallest(limit, dates)
     
     print("=" * 80)
     print(f" AVAILABLE DEPARTURE DATES (showing first {limit})")
     print("=" * 80)
     print()
     
-    for i, date in enumerate(sorted_dates[:limit], 1):
+    for i, date in enumerate(first_dates, 1):
         print(f"  {i:2}. {date}")
     
-    if len(sorted_dates) > limit:
-        print(f"  ... and {len(sorted_dates) - limit} more dates")
+    if len(dates) > limit:
+        print(f"  ... and {len(dates) - limit} more dates")
     
     print()
-    print(f"Total unique departure dates: {len(sorted_dates)}")
+    print(f"Total unique departure dates: {len(dates)}")
     print()
 
 
@@ -165,7 +200,7 @@ def main():
     
     # If no data found, show available dates
     if results['total_requests'] == 0:
-        show_available_dates(csv_file, limit=10)
+        show_available_dates(csv_file, limit=10, dates=results['available_dates'])
 
 
 if __name__ == '__main__':
@@ -21,36 +21,45 @@ import csv
 import sys
 
 
+# Columns to drop
+_DROP_COLUMNS = frozenset({
+    'offered_classes',
+    'offered_fares',
+    'offered_change_fees',
+    'offered_non_refundable',
+    'offered_saturday_stay'
+})
+
+
 def create_simplified_csv(input_file, output_file):
     """Create simplified CSV by dropping offered option columns"""
     
-    # Columns to drop
-    columns_to_drop = [
-        'offered_classes',
-        'offered_fares', 
-        'offered_change_fees',
-        'offered_non_refundable',
-        'offered_saturday_stay'
-    ]
-    
-    # Read the complete CSV
-    with open(input_file, 'r') as infile:
-        reader = csv.DictReader(infile)
-        fieldnames = reader.fieldnames
-        
-        # Create new fieldnames list without dropped columns
-        new_fieldnames = [col for col in fieldnames if col not in columns_to_drop]
+    # Stream the complete CSV straight into the simplified one, with 1 MiB buffers
+    with open(input_file, 'r', newline='', buffering=1 << 20) as infile:
+        reader = csv.reader(infile)
+        fieldnames = next(reader, None)
+        if fieldnames is None:
+            return 0, 0, 0
         
-        # Read all rows
-        rows = list(reader)
+        # Indices of the columns to keep; rows are projected as plain lists
+        keep_idx = [i for i, col in enumerate(fieldnames) if col not in _DROP_COLUMNS]
+        new_fieldnames = [fieldnames[i] for i in keep_idx]
         
-        # Write to new CSV file
-        with open(output_file, 'w', newline='') as outfile:
-            writer = csv.DictWriter(outfile, fieldnames=new_fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(rows)
+        # The output is only opened (and truncated) once the input header has been read
+        with open(output_file, 'w', newline='', buffering=1 << 20) as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(new_fieldnames)
+            
+            # Write row by row so memory does not grow with the file size
+            row_count = 0
+            for row in reader:
+                # Blank lines come through as [] and are dropped, as DictReader did
+                if not row:
+                    continue
+                writer.writerow([row[i] for i in keep_idx])
+                row_count += 1
     
-    return len(rows), len(fieldnames), len(new_fieldnames)
+    return row_count, len(fieldnames), len(new_fieldnames)
 
 
 def main():
@@ -9,8 +9,107 @@ Extract complete booking request data from tvlsim.log including:
 
 import re
 import csv
-from collections import defaultdict
-from datetime import datetime
+import mmap
+import multiprocessing
+import operator
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass, fields
+from datetime import date
+from typing import Optional
+
+
+# Patterns are compiled once at import time and reused for every log line
+# Format: At <timestamp>, for (<pos>, <channel>) <origin>-<dest> (<trip_type>) <dep_date> (<stay_duration> days) <dep_time> <cabin> <party> <ff> <wtp> <vot> <cf> <cfd> <nr> <nrd>
+_REQ_RE = re.compile(r'At (\S+ \S+), for \((\S+), (\S+)\) (\S+)-(\S+) \((\S+)\) (\S+) \((\d+) days\) (\S+) (\S) (\d+) (\S) ([\d.]+) ([\d.]+) (\d+) (\d+) (\d+) (\d+)')
+_FARE_RE = re.compile(r"A corresponding fare option for the '[A-Z]+ ([A-Z])' class is: Class path: ([A-Z]); ([\d.]+) EUR; conditions: (\d+) (\d+) (\d+)")
+_AVAIL_RE = re.compile(r"Fare option Class path: ([A-Z]);.*Availability (\d+)")
+_CHOSEN_SEG_RE = re.compile(r"Segment path: ([A-Z]+); (\d+),")
+_CHOSEN_FARE_RE = re.compile(r"Chosen fare option: Class path: ([A-Z]); ([\d.]+) EUR; conditions: (\d+) (\d+) (\d+)")
+_SALE_RE = re.compile(r"Made a sell of (\d+) persons.*Successful\? ([01])")
+
+# Markers of the log lines the extractor acts on. _TAG_RE runs over the raw
+# mapped file and consumes the rest of the line, so each match is one line and
+# only lines carrying a marker are ever copied or decoded
+_REQUEST_MARKER = b'Poped booking request:'
+_TAG_RE = re.compile(rb'(Poped booking request:|A corresponding fare option|Fare option Class path:|Chosen TS:|Made a sell of|There is no chosen travel solution)[^\n]*')
+
+
+# Fare class letters (A-Z) index a fixed 26-slot availability list
+_SLOT_Y = ord('Y') - 65
+_SLOT_B = ord('B') - 65
+_SLOT_M = ord('M') - 65
+
+# Month abbreviations used in log dates such as '2012-Apr-30'
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+
+def _parse_log_date(value):
+    """
+    Parse the 'YYYY-Mon-DD' date at the start of a log date or timestamp.
+    
+    Slices the fixed-width fields directly instead of going through strptime.
+    """
+    return date(int(value[0:4]), _MONTHS[value[5:8]], int(value[9:11]))
+
+
+@dataclass(slots=True)
+class Booking:
+    """
+    One booking request and its outcome, in CSV column order.
+    
+    Slotted so that millions of records stay compact; fields left as None are
+    written as empty CSV cells.
+    """
+    request_id: int = 0
+    line_number: int = 0
+    request_timestamp: str = ''
+    departure_date: str = ''
+    days_to_departure: Optional[int] = None
+    stay_duration: int = 0
+    departure_time: str = ''
+    origin: str = ''
+    destination: str = ''
+    airline: Optional[str] = None
+    flight_number: Optional[str] = None
+    trip_type: str = ''
+    pos: str = ''
+    channel: str = ''
+    cabin: str = ''
+    party_size: int = 0
+    ff_status: str = ''
+    wtp: float = 0.0
+    value_of_time: float = 0.0
+    change_fees: int = 0
+    change_fee_disutility: int = 0
+    non_refundable: int = 0
+    non_refundable_disutility: int = 0
+    offered_classes: str = ''
+    offered_fares: str = ''
+    offered_change_fees: Optional[str] = None
+    offered_non_refundable: Optional[str] = None
+    offered_saturday_stay: Optional[str] = None
+    availability_Y_before: int = 0
+    availability_B_before: int = 0
+    availability_M_before: int = 0
+    customer_chose: bool = False
+    chosen_class: Optional[str] = None
+    chosen_fare: Optional[float] = None
+    chosen_change_fee: Optional[int] = None
+    chosen_non_refundable: Optional[int] = None
+    chosen_saturday_stay: Optional[int] = None
+    sale_successful: bool = False
+    sold_party_size: Optional[int] = None
+
+
+# CSV column order is the Booking field order; the header and row getter are
+# derived from the dataclass once at import time
+_CSV_FIELDNAMES = tuple(field.name for field in fields(Booking))
+_ROW_VALUES = operator.attrgetter(*_CSV_FIELDNAMES)
 
 
 def parse_booking_request(line):
@@ -38,79 +137,76 @@ def parse_booking_request(line):
     """
     
     # Pattern: Now captures departure_time (group 9) and disutility fields (groups 16, 18)
-    # Format: At <timestamp>, for (<pos>, <channel>) <origin>-<dest> (<trip_type>) <dep_date> (<stay_duration> days) <dep_time> <cabin> <party> <ff> <wtp> <vot> <cf> <cfd> <nr> <nrd>
-    pattern = r'At (\S+ \S+), for \((\S+), (\S+)\) (\S+)-(\S+) \((\S+)\) (\S+) \((\d+) days\) (\S+) (\S) (\d+) (\S) ([\d.]+) ([\d.]+) (\d+) (\d+) (\d+) (\d+)'
-    
-    match = re.search(pattern, line)
+    match = _REQ_RE.search(line)
     if match:
-        from datetime import datetime
+        # Unpack all groups at once instead of one match.group() call per field
+        (request_ts, pos, channel, origin, destination, trip_type, departure_date,
+         stay_duration, departure_time, cabin, party_size, ff_status, wtp,
+         value_of_time, change_fees, change_fee_disutility, non_refundable,
+         non_refundable_disutility) = match.groups()
         
         # Parse dates to calculate actual DTD
-        request_ts = match.group(1)
-        departure_date = match.group(7)
         
         try:
-            req_dt = datetime.strptime(request_ts, '%Y-%b-%d %H:%M:%S.%f')
-            dep_dt = datetime.strptime(departure_date, '%Y-%b-%d')
-            days_to_departure = (dep_dt - req_dt).days
-        except:
+            days_to_departure = (_parse_log_date(departure_date) - _parse_log_date(request_ts)).days
+            # Departure is taken at midnight, so a request made after 00:00 is one day less out
+            if request_ts[12:].strip('0:.'):
+                days_to_departure -= 1
+        except (KeyError, ValueError):
             days_to_departure = None
         
-        return {
-            'request_timestamp': request_ts,
-            'pos': match.group(2),
-            'channel': match.group(3),  # FIXED: was "customer_type", now correct
-            'origin': match.group(4),
-            'destination': match.group(5),
-            'trip_type': match.group(6),
-            'departure_date': departure_date,
-            'stay_duration': int(match.group(8)),  # CORRECTED: This is stay duration, not DTD
-            'days_to_departure': days_to_departure,  # NEW: Calculated actual DTD
-            'departure_time': match.group(9),  # NEW: Added departure time
-            'cabin': match.group(10),
-            'party_size': int(match.group(11)),
-            'ff_status': match.group(12),
-            'wtp': float(match.group(13)),
-            'value_of_time': float(match.group(14)),
-            'change_fees': int(match.group(15)),
-            'change_fee_disutility': int(match.group(16)),  # NEW: Added disutility
-            'non_refundable': int(match.group(17)),
-            'non_refundable_disutility': int(match.group(18))  # NEW: Added disutility
-        }
+        return Booking(
+            request_timestamp=request_ts,
+            # Low-cardinality codes are interned so millions of bookings share one string each
+            pos=sys.intern(pos),
+            channel=sys.intern(channel),  # FIXED: was "customer_type", now correct
+            origin=sys.intern(origin),
+            destination=sys.intern(destination),
+            trip_type=sys.intern(trip_type),
+            departure_date=sys.intern(departure_date),
+            stay_duration=int(stay_duration),  # CORRECTED: This is stay duration, not DTD
+            days_to_departure=days_to_departure,  # NEW: Calculated actual DTD
+            departure_time=departure_time,  # NEW: Added departure time
+            cabin=sys.intern(cabin),
+            party_size=int(party_size),
+            ff_status=sys.intern(ff_status),
+            wtp=float(wtp),
+            value_of_time=float(value_of_time),
+            change_fees=int(change_fees),
+            change_fee_disutility=int(change_fee_disutility),  # NEW: Added disutility
+            non_refundable=int(non_refundable),
+            non_refundable_disutility=int(non_refundable_disutility)  # NEW: Added disutility
+        )
     return None
 
 
-def parse_fare_options(lines, start_idx, direction='forward'):
+def parse_fare_option(line):
     """
-    Parse fare options provided to the customer.
+    Parse a fare option provided to the customer.
     
     Format: A corresponding fare option for the 'SQ Y' class is: Class path: Y; 400 EUR; conditions: 0 0 0
     """
-    fare_options = []
     
-    # Determine search range
-    if direction == 'forward':
-        search_range = range(start_idx, min(start_idx + 50, len(lines)))
-    else:  # backward
-        search_range = range(max(0, start_idx - 50), start_idx)
+    # Parse fare option from FareQuoter output
+    # Pattern: A corresponding fare option for the 'SQ X' class is: Class path: X; ### EUR; conditions: # # #
+    match = _FARE_RE.search(line)
+    if match:
+        _, cls, fare, change_fee_cond, non_refundable_cond, saturday_stay_cond = match.groups()
+        return {
+            'class': cls,
+            'fare': float(fare),
+            'change_fee_cond': int(change_fee_cond),
+            'non_refundable_cond': int(non_refundable_cond),
+            'saturday_stay_cond': int(saturday_stay_cond)
+        }
+    return None
+
+
+def summarize_fare_options(fare_options):
+    """
+    Convert the fare options offered for a request to concatenated strings.
+    """
     
-    # Look for fare option lines
-    for i in search_range:
-        line = lines[i]
-            
-        # Parse fare option from FareQuoter output
-        # Pattern: A corresponding fare option for the 'SQ X' class is: Class path: X; ### EUR; conditions: # # #
-        match = re.search(r"A corresponding fare option for the '[A-Z]+ ([A-Z])' class is: Class path: ([A-Z]); ([\d.]+) EUR; conditions: (\d+) (\d+) (\d+)", line)
-        if match:
-            fare_options.append({
-                'class': match.group(2),
-                'fare': float(match.group(3)),
-                'change_fee_cond': int(match.group(4)),
-                'non_refundable_cond': int(match.group(5)),
-                'saturday_stay_cond': int(match.group(6))
-            })
-    
-    # Convert list to dict with concatenated strings
     if fare_options:
         return {
             'offered_classes': ','.join([opt['class'] for opt in fare_options]),
@@ -123,30 +219,22 @@ def parse_fare_options(lines, start_idx, direction='forward'):
     return {}
 
 
-def parse_availability(lines, start_idx, direction='forward'):
+def parse_availability(line):
     """
-    Parse availability for each fare class.
+    Parse availability of a fare class.
     
     Format: Fare option Class path: Y; 400 EUR; conditions: 0 0 0, Availability 16, Segment Path ...
-    """
-    availability = {}
-    
-    # Determine search range
-    if direction == 'forward':
-        search_range = range(start_idx, min(start_idx + 50, len(lines)))
-    else:  # backward
-        search_range = range(max(0, start_idx - 50), start_idx)
     
-    # Look for availability lines
-    for i in search_range:
-        line = lines[i]
-            
-        # Parse availability from InventoryManager output
-        match = re.search(r"Fare option Class path: ([A-Z]);.*Availability (\d+)", line)
-        if match:
-            availability[match.group(1)] = int(match.group(2))
+    Returns:
+        Tuple of (class, available seats) or None
+    """
     
-    return availability
+    # Parse availability from InventoryManager output
+    match = _AVAIL_RE.search(line)
+    if match:
+        cls, seats = match.groups()
+        return cls, int(seats)
+    return None
 
 
 def parse_chosen_solution(line):
@@ -158,20 +246,20 @@ def parse_chosen_solution(line):
     result = {}
     
     # Parse segment path (airline and flight number)
-    segment_match = re.search(r"Segment path: ([A-Z]+); (\d+),", line)
+    segment_match = _CHOSEN_SEG_RE.search(line)
     if segment_match:
-        result['airline'] = segment_match.group(1)
-        result['flight_number'] = segment_match.group(2)
+        result['airline'], result['flight_number'] = segment_match.groups()
     
     # Parse chosen fare option
-    fare_match = re.search(r"Chosen fare option: Class path: ([A-Z]); ([\d.]+) EUR; conditions: (\d+) (\d+) (\d+)", line)
+    fare_match = _CHOSEN_FARE_RE.search(line)
     if fare_match:
+        chosen_class, chosen_fare, change_fee, non_refundable, saturday_stay = fare_match.groups()
         result.update({
-            'chosen_class': fare_match.group(1),
-            'chosen_fare': float(fare_match.group(2)),
-            'chosen_change_fee': int(fare_match.group(3)),
-            'chosen_non_refundable': int(fare_match.group(4)),
-            'chosen_saturday_stay': int(fare_match.group(5))
+            'chosen_class': chosen_class,
+            'chosen_fare': float(chosen_fare),
+            'chosen_change_fee': int(change_fee),
+            'chosen_non_refundable': int(non_refundable),
+            'chosen_saturday_stay': int(saturday_stay)
         })
     
     return result if result else None
@@ -184,105 +272,284 @@ def parse_sale_confirmation(line):
     Format: Made a sell of 1 persons on the following travel solution: ... Successful? 1
     """
     
-    match = re.search(r"Made a sell of (\d+) persons.*Successful\? ([01])", line)
+    match = _SALE_RE.search(line)
     if match:
+        sold_party_size, successful = match.groups()
         return {
-            'sold_party_size': int(match.group(1)),
-            'sale_successful': bool(int(match.group(2)))
+            'sold_party_size': int(sold_party_size),
+            'sale_successful': successful == '1'
         }
     return None
 
 
-def extract_complete_booking_data(log_file='logs/tvlsim.log'):
+# Smallest slice of the log worth handing to a separate worker process
+_MIN_CHUNK_SIZE = 32 << 20
+
+# Readahead hints for scanning a mapped range once, front to back (platform dependent)
+_SCAN_ADVICE = [getattr(mmap, name) for name in ('MADV_SEQUENTIAL', 'MADV_WILLNEED') if hasattr(mmap, name)]
+
+
+def extract_complete_booking_data(log_file='logs/tvlsim.log', workers=None):
     """
     Extract complete booking request data from log file.
+    
+    Large logs are split at booking request lines into byte ranges that are
+    parsed in parallel by a pool of worker processes.
+    
+    Args:
+        log_file: Path to the TvlSim log
+        workers: Maximum number of worker processes (default: CPU count)
     """
     
     print(f"Reading {log_file}...")
     
-    # Read all lines into memory for lookahead
-    with open(log_file, 'r') as f:
-        lines = f.readlines()
+    with open(log_file, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        
+        # mmap cannot map an empty file
+        if size == 0:
+            print("✓ Scanned 0 lines")
+            print("✓ Extracted 0 booking requests")
+            return []
+        
+        parts = max(1, min(workers or os.cpu_count() or 1, size // _MIN_CHUNK_SIZE))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = _split_at_requests(mm, parts)
+    
+    if len(ranges) == 1:
+        results = [_extract_range(log_file, *ranges[0])]
+    else:
+        with multiprocessing.Pool(len(ranges)) as pool:
+            results = pool.starmap(_extract_range, [(log_file, start, end) for start, end in ranges])
+    
+    # Stitch the chunks back together with global line numbers and request ids
+    bookings = []
+    line_count = 0
+    for chunk_bookings, chunk_line_count in results:
+        for booking in chunk_bookings:
+            booking.line_number += line_count
+            booking.request_id = len(bookings) + 1
+            bookings.append(booking)
+        line_count += chunk_line_count
+    
+    print(f"✓ Scanned {line_count:,} lines")
+    print(f"✓ Extracted {len(bookings):,} booking requests")
+    
+    return bookings
+
+
+def _split_at_requests(mm, parts):
+    """
+    Split a mapped log into up to `parts` byte ranges of similar size.
+    
+    Every range after the first starts on a booking request line that parses,
+    so each one can be parsed on its own (a malformed request line does not
+    end the request in progress).
+    """
+    size = len(mm)
+    bounds = [0]
+    
+    for k in range(1, parts):
+        pos = max(size * k // parts, bounds[-1])
+        while True:
+            pos = mm.find(_REQUEST_MARKER, pos)
+            if pos == -1:
+                break
+            start = mm.rfind(b'\n', 0, pos) + 1
+            stop = mm.find(b'\n', pos)
+            line = mm[start:stop if stop != -1 else size].decode(errors='replace')
+            if parse_booking_request(line):
+                break
+            pos += len(_REQUEST_MARKER)
+        if pos == -1:
+            break
+        if start > bounds[-1]:
+            bounds.append(start)
+    
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _extract_range(log_file, start, end):
+    """
+    Parse the lines in the byte range [start, end) of the log.
+    
+    Runs in a worker process, so the file is mapped again here.
+    
+    Returns:
+        Tuple of (bookings, number of lines scanned); line numbers are relative to start
+    """
+    with open(log_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Let the kernel prefetch the range aggressively; helps most on cold-cache logs
+            page_start = start - start % mmap.PAGESIZE
+            for advice in _SCAN_ADVICE:
+                mm.madvise(advice, page_start, end - page_start)
+            
+            tagged_lines = _TaggedLines(mm, start, end)
+            bookings = _extract_bookings(tagged_lines)
+            
+            # Newlines are already counted up to the last marked line; only the tail is left
+            line_number, counted_to = tagged_lines.finish()
+            line_count = line_number - 1 + _count_newlines(mm, counted_to, end)
+            if end > start and mm[end - 1] != ord('\n'):
+                line_count += 1  # last line without a trailing newline
+    
+    return bookings, line_count
+
+
+def _scan_tagged_lines(mm, start, end):
+    """
+    Yield (line number, tag, line) for every line in [start, end) carrying a marker.
+    
+    The marker regex runs over the mapping itself instead of line by line;
+    line numbers are relative to start and counted only up to each match.
     
-    print(f"✓ Loaded {len(lines):,} lines")
+    Returns:
+        (line number, offset) of the start of the last marked line, or (1, start)
+        if there is none; use _TaggedLines to get at it
+    """
+    line_number = 1
+    counted_to = start
+    
+    for match in _TAG_RE.finditer(mm, start, end):
+        newline = mm.rfind(b'\n', start, match.start())
+        line_start = newline + 1 if newline != -1 else start
+        line_number += _count_newlines(mm, counted_to, line_start)
+        counted_to = line_start
+        
+        yield line_number, match.group(1), mm[line_start:match.end()].decode()
+    
+    return line_number, counted_to
+
+
+class _TaggedLines:
+    """
+    Iterable over _scan_tagged_lines that keeps the scan's final position.
+    
+    A for loop discards a generator's return value, so the scan is stepped here
+    and finish() hands the (line number, offset) back. The scan is not closed
+    when a consumer stops early, so finish() can still run it to the end.
+    """
+    
+    def __init__(self, mm, start, end):
+        self._lines = _scan_tagged_lines(mm, start, end)
+        self._position = None
+    
+    def __iter__(self):
+        while True:
+            try:
+                tagged_line = next(self._lines)
+            except StopIteration as stop:
+                self._position = stop.value
+                return
+            yield tagged_line
+    
+    def finish(self):
+        """Skip any marked lines not read yet and return the scan's (line number, offset)"""
+        if self._position is None:
+            for _ in self:
+                pass
+        return self._position
+
+
+def _count_newlines(mm, start, end, block_size=1 << 24):
+    """Count newlines in mm[start:end], copying at most block_size bytes at a time"""
+    count = 0
+    for pos in range(start, end, block_size):
+        count += mm[pos:min(pos + block_size, end)].count(b'\n')
+    return count
+
+
+def _extract_bookings(tagged_lines):
+    """
+    Walk the marked log lines and assemble one record per completed booking request.
+    
+    Fare options and availability are logged before the customer choice, so
+    they are collected as the lines go by and consumed on 'Chosen TS:'.
+    """
     
     bookings = []
     current_request = None
-    current_fare_options = None
-    current_availability = None
+    pending_fare_options = []
+    pending_availability = [0] * 26
     
-    for i, line in enumerate(lines):
+    for line_number, tag, line in tagged_lines:
+
         # Parse booking request
-        if 'Poped booking request:' in line:
+        if tag == b'Poped booking request:':
             request = parse_booking_request(line)
             if request:
+                # Offer, choice and sale fields keep their Booking defaults until seen
                 current_request = request
-                current_request['request_id'] = len(bookings) + 1
-                current_request['line_number'] = i + 1
-                
-                # Initialize with defaults (will be updated when we find choice/denial)
-                current_request['offered_classes'] = ''
-                current_request['offered_fares'] = ''
-                
-                # Add availability defaults
-                for cls in ['Y', 'B', 'M']:
-                    current_request[f'availability_{cls}_before'] = 0
+                current_request.request_id = len(bookings) + 1
+                current_request.line_number = line_number
                 
-                # Default values for choice (will be updated if chosen)
-                current_request['customer_chose'] = False
-                current_request['chosen_class'] = None
-                current_request['chosen_fare'] = None
-                current_request['sale_successful'] = False
+                # Options logged from here on belong to this request; a malformed
+                # request line leaves the one in progress and its options alone
+                pending_fare_options = []
+                pending_availability = [0] * 26
+        
+        # Collect fare options offered to the customer
+        elif tag == b'A corresponding fare option':
+            fare_option = parse_fare_option(line)
+            if fare_option:
+                pending_fare_options.append(fare_option)
+        
+        # Collect availability for each fare class
+        elif tag == b'Fare option Class path:':
+            availability = parse_availability(line)
+            if availability:
+                cls, seats = availability
+                pending_availability[ord(cls) - 65] = seats
         
         # Parse chosen solution (customer choice)
-        elif 'Chosen TS:' in line and current_request:
+        elif tag == b'Chosen TS:' and current_request:
             choice = parse_chosen_solution(line)
             if choice:
-                current_request['customer_chose'] = True
-                current_request['airline'] = choice.get('airline', '')
-                current_request['flight_number'] = choice.get('flight_number', '')
-                current_request['chosen_class'] = choice.get('chosen_class', '')
-                current_request['chosen_fare'] = choice.get('chosen_fare', 0.0)
-                current_request['chosen_change_fee'] = choice.get('chosen_change_fee', '')
-                current_request['chosen_non_refundable'] = choice.get('chosen_non_refundable', '')
-                current_request['chosen_saturday_stay'] = choice.get('chosen_saturday_stay', '')
+                current_request.customer_chose = True
+                current_request.airline = choice.get('airline', '')
+                current_request.flight_number = choice.get('flight_number', '')
+                current_request.chosen_class = choice.get('chosen_class', '')
+                current_request.chosen_fare = choice.get('chosen_fare', 0.0)
+                current_request.chosen_change_fee = choice.get('chosen_change_fee', '')
+                current_request.chosen_non_refundable = choice.get('chosen_non_refundable', '')
+                current_request.chosen_saturday_stay = choice.get('chosen_saturday_stay', '')
                 
-                # Look backward for fare options and availability (they appear before the choice)
-                fare_options_data = parse_fare_options(lines, i, direction='backward')
-                current_availability = parse_availability(lines, i, direction='backward')
+                # Fare options and availability were collected since the request
+                fare_options_data = summarize_fare_options(pending_fare_options)
                 
                 # Update with parsed fare option data (includes classes, fares, and all conditions)
-                if fare_options_data:
-                    current_request.update(fare_options_data)
+                for name, value in fare_options_data.items():
+                    setattr(current_request, name, value)
                 
                 # Update availability
-                for cls in ['Y', 'B', 'M']:
-                    current_request[f'availability_{cls}_before'] = current_availability.get(cls, 0) if current_availability else 0
+                current_request.availability_Y_before = pending_availability[_SLOT_Y]
+                current_request.availability_B_before = pending_availability[_SLOT_B]
+                current_request.availability_M_before = pending_availability[_SLOT_M]
         
         # Parse sale confirmation
-        elif 'Made a sell of' in line and current_request:
+        elif tag == b'Made a sell of' and current_request:
             sale = parse_sale_confirmation(line)
             if sale:
-                current_request['sale_successful'] = sale['sale_successful']
-                current_request['sold_party_size'] = sale['sold_party_size']
+                current_request.sale_successful = sale['sale_successful']
+                current_request.sold_party_size = sale['sold_party_size']
                 
                 # Booking complete - save it
                 bookings.append(current_request)
                 current_request = None
         
         # Parse no choice (denied booking)
-        elif 'There is no chosen travel solution' in line and current_request:
-            current_request['customer_chose'] = False
-            current_request['chosen_class'] = 'DENIED'
-            current_request['chosen_fare'] = 0.0
-            current_request['sale_successful'] = False
+        elif tag == b'There is no chosen travel solution' and current_request:
+            current_request.customer_chose = False
+            current_request.chosen_class = 'DENIED'
+            current_request.chosen_fare = 0.0
+            current_request.sale_successful = False
             
             # Booking complete - save it
             bookings.append(current_request)
             current_request = None
     
-    print(f"✓ Extracted {len(bookings):,} booking requests")
-    
     return bookings
 
 
@@ -295,55 +562,13 @@ def write_complete_csv(bookings, filename='booking_requests_complete.csv'):
         print("No bookings to write")
         return
     
-    with open(filename, 'w', newline='') as f:
-        # Define column order
-        fieldnames = [
-            'request_id',
-            'line_number',
-            'request_timestamp',
-            'departure_date',
-            'days_to_departure',
-            'stay_duration',
-            'departure_time',  # NEW: Added departure time
-            'origin',
-            'destination',
-            'airline',  # NEW: Airline carrier code (e.g., SQ)
-            'flight_number',  # NEW: Flight number
-            'trip_type',
-            'pos',
-            'channel',  # FIXED: was "customer_type"
-            'cabin',
-            'party_size',
-            'ff_status',
-            'wtp',
-            'value_of_time',
-            'change_fees',
-            'change_fee_disutility',  # NEW: Added disutility
-            'non_refundable',
-            'non_refundable_disutility',  # NEW: Added disutility
-            'offered_classes',
-            'offered_fares',
-            'offered_change_fees',  # NEW: Change fee conditions per class
-            'offered_non_refundable',  # NEW: Non-refundable conditions per class
-            'offered_saturday_stay',  # NEW: Saturday stay conditions per class
-            'availability_Y_before',
-            'availability_B_before',
-            'availability_M_before',
-            'customer_chose',
-            'chosen_class',
-            'chosen_fare',
-            'chosen_change_fee',
-            'chosen_non_refundable',
-            'chosen_saturday_stay',  # NEW: Saturday stay condition for chosen option
-            'sale_successful',
-            'sold_party_size'
-        ]
-        
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-        writer.writeheader()
+    with open(filename, 'w', newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(_CSV_FIELDNAMES)
         
-        for booking in bookings:
-            writer.writerow(booking)
+        # Rows are plain attribute tuples; csv.writer writes None as an empty cell
+        # and quotes any field holding a comma, quote or line break
+        writer.writerows(map(_ROW_VALUES, bookings))
     
     print(f"✓ Written: {filename} ({len(bookings):,} rows)")
 
@@ -354,21 +579,34 @@ def write_summary_stats(bookings, filename='booking_summary_stats.txt'):
     """
     
     total_requests = len(bookings)
-    customer_chose = sum(1 for b in bookings if b['customer_chose'])
-    customer_denied = sum(1 for b in bookings if b['chosen_class'] == 'DENIED')
-    successful_sales = sum(1 for b in bookings if b['sale_successful'])
-    
-    # Choice analysis
-    chosen_classes = defaultdict(int)
+    customer_chose = 0
+    successful_sales = 0
+    total_availability_Y = 0
+    total_availability_B = 0
+    total_availability_M = 0
+    
+    # Choice analysis: requests without a choice carry 'DENIED' or None, so
+    # what is left after popping them is the distribution of chosen classes
+    chosen_classes = Counter(b.chosen_class for b in bookings)
+    customer_denied = chosen_classes.pop('DENIED', 0)
+    chosen_classes.pop(None, None)
+    
+    # Gather the remaining counts and totals in a single pass over the bookings
     for b in bookings:
-        if b['customer_chose'] and b['chosen_class'] != 'DENIED':
-            chosen_classes[b['chosen_class']] += 1
+        if b.customer_chose:
+            customer_chose += 1
+        if b.sale_successful:
+            successful_sales += 1
+        
+        # Availability analysis
+        total_availability_Y += b.availability_Y_before
+        total_availability_B += b.availability_B_before
+        total_availability_M += b.availability_M_before
     
-    # Availability analysis
     avg_availability = {
-        'Y': sum(b['availability_Y_before'] for b in bookings) / total_requests,
-        'B': sum(b['availability_B_before'] for b in bookings) / total_requests,
-        'M': sum(b['availability_M_before'] for b in bookings) / total_requests
+        'Y': total_availability_Y / total_requests,
+        'B': total_availability_B / total_requests,
+        'M': total_availability_M / total_requests
     }
     
     with open(filename, 'w') as f:
@@ -407,15 +645,15 @@ def print_sample_records(bookings, n=5):
     
     for i, booking in enumerate(bookings[:n], 1):
         print(f"\nRequest #{i}:")
-        print(f"  Timestamp: {booking['request_timestamp']}")
-        print(f"  Route: {booking['origin']}-{booking['destination']} ({booking['trip_type']})")
-        print(f"  Departure: {booking['departure_date']} (DTD={booking['days_to_departure']} days)")
-        print(f"  Stay Duration: {booking['stay_duration']} days")
-        print(f"  Channel: {booking['channel']}, FF={booking['ff_status']}, WTP={booking['wtp']:.2f}")
-        print(f"  Offered: {booking['offered_classes']} @ {booking['offered_fares']} EUR")
-        print(f"  Availability: Y={booking['availability_Y_before']}, B={booking['availability_B_before']}, M={booking['availability_M_before']}")
-        print(f"  Chose: {booking['chosen_class']} @ {booking.get('chosen_fare', 0):.2f} EUR")
-        print(f"  Sale: {'SUCCESS' if booking['sale_successful'] else 'FAILED/DENIED'}")
+        print(f"  Timestamp: {booking.request_timestamp}")
+        print(f"  Route: {booking.origin}-{booking.destination} ({booking.trip_type})")
+        print(f"  Departure: {booking.departure_date} (DTD={booking.days_to_departure} days)")
+        print(f"  Stay Duration: {booking.stay_duration} days")
+        print(f"  Channel: {booking.channel}, FF={booking.ff_status}, WTP={booking.wtp:.2f}")
+        print(f"  Offered: {booking.offered_classes} @ {booking.offered_fares} EUR")
+        print(f"  Availability: Y={booking.availability_Y_before}, B={booking.availability_B_before}, M={booking.availability_M_before}")
+        print(f"  Chose: {booking.chosen_class} @ {booking.chosen_fare or 0:.2f} EUR")
+        print(f"  Sale: {'SUCCESS' if booking.sale_successful else 'FAILED/DENIED'}")
 
 
 def main():
@@ -423,8 +661,6 @@ def main():
     Main execution.
     """
     
-    import sys
-    
     # Get log file from command line or use default
     log_file = sys.argv[1] if len(sys.argv) > 1 else 'logs/tvlsim.log'
     
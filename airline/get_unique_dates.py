@@ -16,12 +16,16 @@ import sys
 
 def get_unique_dates(csv_file):
     """Extract all unique departure dates from CSV file"""
-    dates = set()
-    
-    with open(csv_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            dates.add(row['departure_date'])
+    with open(csv_file, 'r', newline='', buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        
+        # Only departure_date is needed, so pick it by index instead of building a dict per row
+        date_idx = header.index('departure_date')
+        # Blank lines come through as [] and are skipped, as DictReader did
+        dates = {row[date_idx] for row in reader if row}
     
     return sorted(dates)
 
@@ -17,6 +17,11 @@ Generates two plots:
 import csv
 import sys
 from collections import defaultdict
+from itertools import accumulate
+import matplotlib
+# Plots are only ever saved to PNG, so use the non-interactive Agg backend and
+# skip GUI backend discovery
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
 
@@ -27,24 +32,31 @@ def analyze_data(csv_file, target_date):
     Returns:
         Tuple of (wtp_by_dtd, demand_by_dtd)
     """
-    wtp_by_dtd = defaultdict(list)
+    wtp_sum_by_dtd = defaultdict(float)
     demand_by_dtd = defaultdict(int)
     
-    with open(csv_file, 'r') as f:
-        reader = csv.DictReader(f)
+    with open(csv_file, 'r', newline='', buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return {}, demand_by_dtd
+        
+        # Project only the columns we need by index instead of building a dict per row
+        date_idx = header.index('departure_date')
+        dtd_idx = header.index('days_to_departure')
+        wtp_idx = header.index('wtp')
         
         for row in reader:
-            if row['departure_date'] == target_date:
-                dtd = int(row['days_to_departure'])
-                wtp = float(row['wtp'])
+            # Blank lines come through as [] and are skipped, as DictReader did
+            if row and row[date_idx] == target_date:
+                dtd = int(row[dtd_idx])
                 
-                wtp_by_dtd[dtd].append(wtp)
+                # Keep a running sum per DTD rather than a list of every WTP value
+                wtp_sum_by_dtd[dtd] += float(row[wtp_idx])
                 demand_by_dtd[dtd] += 1
     
     # Calculate mean WTP for each DTD
-    mean_wtp = {}
-    for dtd, wtp_values in wtp_by_dtd.items():
-        mean_wtp[dtd] = sum(wtp_values) / len(wtp_values)
+    mean_wtp = {dtd: wtp_sum / demand_by_dtd[dtd] for dtd, wtp_sum in wtp_sum_by_dtd.items()}
     
     return mean_wtp, demand_by_dtd
 
@@ -80,16 +92,11 @@ def plot_cumulative_bookings(demand_by_dtd, target_date):
     
     # Calculate cumulative bookings from highest DTD (earliest) to 0 (departure)
     dtd_values = sorted(demand_by_dtd.keys())
-    cumulative_dict = {}
-    total = 0
-    
-    # Accumulate from highest DTD down to 0
-    for dtd in sorted(demand_by_dtd.keys(), reverse=True):
-        total += demand_by_dtd[dtd]
-        cumulative_dict[dtd] = total
     
-    # Get cumulative values in ascending DTD order for plotting
-    cumulative = [cumulative_dict[dtd] for dtd in dtd_values]
+    # Accumulate from highest DTD down to 0 in one pass, then flip back to
+    # ascending DTD order for plotting
+    cumulative = list(accumulate(demand_by_dtd[dtd] for dtd in reversed(dtd_values)))[::-1]
+    total = cumulative[0]
     
     plt.figure(figsize=(12, 6))
     plt.plot(dtd_values, cumulative, 'o-', linewidth=2, markersize=4, color='#2E86AB', alpha=0.7)
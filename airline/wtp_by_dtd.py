@@ -28,25 +28,37 @@ def analyze_wtp_by_dtd(csv_file, target_date):
     """
     wtp_by_dtd = defaultdict(list)
     
-    with open(csv_file, 'r') as f:
-        reader = csv.DictReader(f)
+    with open(csv_file, 'r', newline='', buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return {}
         
-        for row in reader:
-            # Check if this booking is for our target date
-            if row['departure_date'] == target_date:
-                dtd = int(row['days_to_departure'])
-                wtp = float(row['wtp'])
-                wtp_by_dtd[dtd].append(wtp)
+        # Project only the columns we need by index instead of building a dict per row
+        date_idx = header.index('departure_date')
+        dtd_idx = header.index('days_to_departure')
+        wtp_idx = header.index('wtp')
+        
+        # Only lines that mention the date at all are handed to the CSV parser;
+        # the exact column check below still decides which rows count
+        matching_rows = csv.reader(line for line in f if target_date in line)
+        
+        for row in matching_rows:
+            # Check if this booking is for our target date (blank lines come through as [])
+            if row and row[date_idx] == target_date:
+                wtp_by_dtd[int(row[dtd_idx])].append(float(row[wtp_idx]))
     
     # Calculate statistics for each DTD
     wtp_stats = {}
     for dtd, wtp_values in sorted(wtp_by_dtd.items()):
+        # One sort per group gives min, max and median together
+        ordered = sorted(wtp_values)
         wtp_stats[dtd] = {
             'count': len(wtp_values),
             'mean': sum(wtp_values) / len(wtp_values),
-            'min': min(wtp_values),
-            'max': max(wtp_values),
-            'median': sorted(wtp_values)[len(wtp_values)//2]
+            'min': ordered[0],
+            'max': ordered[-1],
+            'median': ordered[len(ordered)//2]
         }
     
     return wtp_stats
@@ -61,9 +73,12 @@ def print_wtp_analysis(target_date, wtp_stats):
     
     print("days_to_departure,booking_requests,mean_wtp,min_wtp,max_wtp,median_wtp")
     
+    # Build every row first and emit them in a single write
+    lines = []
     for dtd in sorted(wtp_stats.keys()):
         stats = wtp_stats[dtd]
-        print(f"{dtd},{stats['count']},{stats['mean']:.2f},{stats['min']:.2f},{stats['max']:.2f},{stats['median']:.2f}")
+        lines.append(f"{dtd},{stats['count']},{stats['mean']:.2f},{stats['min']:.2f},{stats['max']:.2f},{stats['median']:.2f}")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def main():